@@ -10,13 +10,13 @@
 
 import getpass
 import importlib
-import json
 import networkx as nx
 import pathlib
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, List, Optional
 from ..common.task import Task, TaskType
+from ..utils import write_json
 from ..version import __version__
 
 from ..wfchef.utils import create_graph
@@ -93,12 +93,12 @@ class Workflow(nx.DiGraph):
         self.tasks_children[parent].add(child)
         self.add_edge(parent, child, weight=0)
 
-    def write_json(self, json_file_path: Optional[pathlib.Path] = None) -> None:
+    def as_dict(self) -> Dict:
         """
-        Write a JSON file of the workflow instance.
+        A JSON representation of the workflow instance (WfFormat).
 
-        :param json_file_path: JSON output file name.
-        :type json_file_path: Optional[pathlib.Path]
+        :return: A JSON object representation of the workflow instance.
+        :rtype: Dict
         """
         workflow_machines = []
         machines_list = []
@@ -154,11 +154,23 @@ class Workflow(nx.DiGraph):
         if workflow_machines:
             workflow_json["workflow"]["machines"] = workflow_machines
 
+        return workflow_json
+
+    def write_json(self, json_file_path: Optional[pathlib.Path] = None, indent: Optional[int] = 4) -> None:
+        """
+        Write a JSON file of the workflow instance.
+
+        :param json_file_path: JSON output file name.
+        :type json_file_path: Optional[pathlib.Path]
+        :param indent: Indentation level of the JSON file (compact JSON if None).
+        :type indent: Optional[int]
+        """
+        workflow_json = self.as_dict()
+
         # write to file
         if not json_file_path:
             json_file_path = pathlib.Path(f"{self.name.lower()}.json")
-        with open(json_file_path, "w") as outfile:
-            outfile.write(json.dumps(workflow_json, indent=4))
+        write_json(workflow_json, json_file_path, indent)
         
         self.workflow_json = workflow_json
 
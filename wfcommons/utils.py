@@ -11,17 +11,27 @@
 import json
 import logging
 import math
+import os
 import pathlib
 import scipy.stats
 import warnings
 import numpy as np
 import operator as op
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from functools import reduce
 from logging import Logger
 from typing import Any, Dict, Optional, List, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_RANDOM_POOL_SIZE = 8 << 20  # 8 MiB
+_random_pool: Optional[bytes] = None
+
 
 class NoValue(Enum):
     def __repr__(self):
@@ -30,7 +40,7 @@ class NoValue(Enum):
 
 def read_json(instance_filename: pathlib.Path) -> Dict[str, Any]:
     """
-    Read the JSON from the file path.
+    Read the JSON from the file path. The (optional) orjson parser is used when available.
 
     :param instance_filename: The absolute path of the instance file.
     :type instance_filename: str
@@ -38,10 +48,36 @@ def read_json(instance_filename: pathlib.Path) -> Dict[str, Any]:
     :return: The json object loaded with json data from the file
     :rtype: Dict[str, Any]
     """
+    if orjson is not None:
+        try:
+            return orjson.loads(pathlib.Path(instance_filename).read_bytes())
+        except orjson.JSONDecodeError:
+            pass  # e.g., non-standard NaN/Infinity literals, which only the json module accepts
     with open(instance_filename) as data:
         return json.load(data)
 
 
+def write_json(data: Dict[str, Any], json_file_path: pathlib.Path, indent: Optional[int] = None) -> None:
+    """
+    Write a JSON object to a file. The json module is always used (rather than the optional
+    orjson serializer), since it preserves non-finite floats as NaN/Infinity literals.
+
+    :param data: The JSON object.
+    :type data: Dict[str, Any]
+    :param json_file_path: The path of the output file.
+    :type json_file_path: pathlib.Path
+    :param indent: Indentation level (compact JSON if None).
+    :type indent: Optional[int]
+    """
+    with open(json_file_path, "w") as fp:
+        if indent is None:
+            # one-shot encoding uses the C-accelerated encoder
+            fp.write(json.dumps(data))
+        else:
+            # indented JSON is always produced by the pure-Python encoder, so stream it
+            json.dump(data, fp, indent=indent)
+
+
 def best_fit_distribution(data: List[float], logger: Optional[Logger] = None) -> Tuple:
     """
     Fit a list of values to a distribution.
@@ -143,3 +179,81 @@ def ncr(n: int, r: int) -> int:
     numerator = reduce(op.mul, range(n, n - r, -1), 1)
     denominator = reduce(op.mul, range(1, r + 1), 1)
     return numerator // denominator
+
+
+def generate_files(files: List[Tuple[pathlib.Path, int]], preallocate: Optional[bool] = False) -> None:
+    """
+    Create a batch of files, either filled with random bytes or only preallocated on disk.
+
+    Random contents are copied from a single block of random bytes (generated once per process),
+    starting at a random offset for each file, so files do not share their contents block for
+    block. Contents still repeat every 8 MiB within a file, so storage with data deduplication
+    may store large files in less space than their size.
+
+    :param files: List of (file path, file size in bytes) pairs.
+    :type files: List[Tuple[pathlib.Path, int]]
+    :param preallocate: Whether to only preallocate the files instead of filling them with random bytes.
+    :type preallocate: Optional[bool]
+    """
+    if not files:
+        return
+    if preallocate:
+        create_file = _preallocate_file
+    else:
+        create_file = _write_random_file
+        _get_random_pool()  # generate the random block before the workers start
+    with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+        # consume the iterator so that any exception raised by a worker is propagated
+        list(executor.map(lambda f: create_file(*f), files))
+
+
+def _preallocate_file(file: pathlib.Path, file_size: int) -> None:
+    """
+    Create a file and reserve its disk space without writing its contents (the file reads back as zeros).
+
+    :param file: Path of the file to be created.
+    :type file: pathlib.Path
+    :param file_size: File size in bytes.
+    :type file_size: int
+    """
+    fd = os.open(file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if file_size > 0:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, file_size)
+            else:
+                os.ftruncate(fd, file_size)
+    finally:
+        os.close(fd)
+
+
+def _write_random_file(file: pathlib.Path, file_size: int) -> None:
+    """
+    Write a file filled with random bytes.
+
+    :param file: Path of the file to be written.
+    :type file: pathlib.Path
+    :param file_size: File size in bytes.
+    :type file_size: int
+    """
+    pool = _get_random_pool()
+    offset = int.from_bytes(os.urandom(4), "little") % len(pool)
+    with open(file, 'wb') as fp:
+        remaining = file_size
+        while remaining > 0:
+            remaining -= fp.write(pool[offset:offset + remaining])
+            offset = 0
+
+
+def _get_random_pool() -> memoryview:
+    """
+    Get a block of random bytes that is generated once and reused for filling benchmark files
+    (file contents are never inspected, so there is no need to draw fresh random bytes per file).
+
+    :return: A read-only view of the random bytes block.
+    :rtype: memoryview
+    """
+    global _random_pool
+    if _random_pool is None:
+        _random_pool = os.urandom(_RANDOM_POOL_SIZE)
+    return memoryview(_random_pool)
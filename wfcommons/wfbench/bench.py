@@ -9,19 +9,25 @@
 # (at your option) any later version.
 
 import glob
+import hashlib
 import json
 import logging
 import os
 import pathlib
+import pickle
 import subprocess
-import time
+import tempfile
 import uuid
 import sys
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from logging import Logger
-from typing import Dict, Optional, List, Set, Tuple, Type, Union
+from typing import Any, Callable, Deque, Dict, Optional, List, Set, Tuple, Type, Union
 
 from ..common import File, FileLink, Task, Workflow
+from ..utils import generate_files, read_json
+from ..version import __version__
 
 from ..wfchef.wfchef_abstract_recipe import WfChefWorkflowRecipe
 from ..wfgen import WorkflowGenerator
@@ -30,6 +36,8 @@ this_dir = pathlib.Path(__file__).resolve().parent
 
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
+_WORKFLOW_CACHE_DIR = pathlib.Path("~/.cache/wfcommons")
+
 
 class WorkflowBenchmark:
     """Generate a workflow benchmark instance based on a workflow recipe (WfChefWorkflowRecipe)
@@ -69,7 +77,7 @@ class WorkflowBenchmark:
         :return: The path to the workflow benchmark JSON instance.
         :rtype: pathlib.Path
         """
-        params = json.loads(input_file.read_text())
+        params = read_json(input_file)
         return self.create_benchmark(save_dir, lock_files_folder=lock_files_folder, **params)
 
     def create_benchmark_from_synthetic_workflow(
@@ -81,7 +89,8 @@ class WorkflowBenchmark:
             gpu_work: Union[int, Dict[str, int]] = None,
             time: Optional[int] = None,
             mem: Optional[float] = None,
-            lock_files_folder: Optional[pathlib.Path] = None) -> pathlib.Path:
+            lock_files_folder: Optional[pathlib.Path] = None,
+            pretty: Optional[bool] = False) -> pathlib.Path:
         """Create a workflow benchmark from a synthetic workflow
 
         :param save_dir: Folder to generate the workflow benchmark JSON instance and input data files.
@@ -100,6 +109,8 @@ class WorkflowBenchmark:
         :type mem: Optional[float]
         :param lock_files_folder:
         :type lock_files_folder: Optional[pathlib.Path]
+        :param pretty: Whether to write an indented (human-readable) workflow benchmark JSON instance.
+        :type pretty: Optional[bool]
 
         :return: The path to the workflow benchmark JSON instance.
         :rtype: pathlib.Path
@@ -113,41 +124,41 @@ class WorkflowBenchmark:
         json_path = save_dir.joinpath(
             f"{self.workflow.name.lower()}-{self.num_tasks}").with_suffix(".json")
 
-        # if no cpu_work is provided, use the maximum runtime of each task as a reference
-        if cpu_work is None:
-            cpu_work = {}
-            for task in self.workflow.tasks.values():
-                if task.category not in cpu_work or task.runtime > cpu_work[task.category]:
-                    cpu_work[task.category] = task.runtime
-            for key in cpu_work.keys():
-                cpu_work[key] *= 1000
-
-        cores, lock = self._creating_lock_files(lock_files_folder)
-
         task_max_runtimes = {}
         for task in self.workflow.tasks.values():
             if task.category not in task_max_runtimes or task.runtime > task_max_runtimes[task.category]:
                 task_max_runtimes[task.category] = task.runtime
         max_runtime = max(runtime for runtime in task_max_runtimes.values())
 
+        # if no cpu_work is provided, use the maximum runtime of each task as a reference
+        if cpu_work is None:
+            cpu_work = {category: runtime * 1000 for category, runtime in task_max_runtimes.items()}
+
+        lock_params = self._lock_files_params(lock_files_folder)
+
+        percent_cpu_of = _category_lookup(percent_cpu)
+        cpu_work_of = _category_lookup(cpu_work)
+        gpu_work_of = _category_lookup(gpu_work)
+        percent_cpu_factor = _runtime_factor_lookup(percent_cpu, task_max_runtimes, max_runtime)
+        cpu_work_factor = _runtime_factor_lookup(cpu_work, task_max_runtimes, max_runtime)
+        gpu_work_factor = _runtime_factor_lookup(gpu_work, task_max_runtimes, max_runtime)
+
         for task in self.workflow.tasks.values():
             runtime_factor = task.runtime / max_runtime
-            task_runtime_factor = task.runtime / task_max_runtimes[task.category]
             # scale argument parameters to achieve a runtime distribution
-            task_percent_cpu = percent_cpu[task.category] * task_runtime_factor if isinstance(percent_cpu, dict) else percent_cpu * runtime_factor
-            task_cores = int(10 * task_percent_cpu)  # set number of cores to cpu threads in wfbench.py
-            task_percent_cpu = max(0.1, task_percent_cpu)  # set minimum to 0.1 which is equivalent to 1 thread in wfbench.py
-            task_percent_cpu = round(task_percent_cpu, 2)
-            if cpu_work is not None:
-                task_cpu_work = cpu_work[task.category] * task_runtime_factor if isinstance(cpu_work, dict) else cpu_work * runtime_factor
-                task_cpu_work = int(task_cpu_work)
+            task_cpu_work = cpu_work_of(task.category)
+            if task_cpu_work:
+                task_cpu_work = int(task_cpu_work * cpu_work_factor(task))
+                task_percent_cpu = percent_cpu_of(task.category) * percent_cpu_factor(task)
+                task_cores = int(10 * task_percent_cpu)  # set number of cores to cpu threads in wfbench.py
+                task_percent_cpu = max(0.1, task_percent_cpu)  # set minimum to 0.1 which is equivalent to 1 thread in wfbench.py
+                task_percent_cpu = round(task_percent_cpu, 2)
             else:
-                task_cpu_work = None
-            if gpu_work is not None:
-                task_gpu_work = gpu_work[task.category] * task_runtime_factor if isinstance(gpu_work, dict) else gpu_work * runtime_factor
-                task_gpu_work = int(task_gpu_work)
-            else:
-                task_gpu_work = None
+                task_percent_cpu = None
+                task_cores = 0
+            task_gpu_work = gpu_work_of(task.category)
+            if task_gpu_work:
+                task_gpu_work = int(task_gpu_work * gpu_work_factor(task))
             task_memory = int(mem * runtime_factor) if mem else None
             self._set_argument_parameters(
                 task,
@@ -156,9 +167,7 @@ class WorkflowBenchmark:
                 task_gpu_work,
                 time,
                 task_memory,
-                lock_files_folder,
-                cores,
-                lock
+                lock_params
             )
             task.cores = task_cores + 1
             if task_memory:
@@ -174,21 +183,25 @@ class WorkflowBenchmark:
             infiles = [f"\"{file.name}\"" for file in task.files if file.link == FileLink.INPUT]
             task.args.extend(infiles)
 
-        workflow_input_files: Dict[str, int] = self._rename_files_to_wfbench_format()
+        workflow_input_files: List[File] = self._rename_files_to_wfbench_format()
 
+        existing_files = _list_files(save_dir)
+        files_to_create: List[str] = []
         for i, file in enumerate(workflow_input_files):
-            file_path = save_dir.joinpath(file.name)
-            if not file_path.is_file():
+            if file.name not in existing_files:
+                file_path = save_dir.joinpath(file.name)
                 print(
                     f"Creating {str(file_path)} ({file.size} bytes) ... file {i+1} out of {len(workflow_input_files)}",
                     end='\r'
                 )
-                with open(save_dir.joinpath("to_create.txt"), "a+") as fp:
-                    fp.write(f"{file.name} {file.size}\n")
+                files_to_create.append(f"{file.name} {file.size}\n")
                 self.logger.debug(f"Created file: {str(file_path)}")
+        if files_to_create:
+            with open(save_dir.joinpath("to_create.txt"), "a+") as fp:
+                fp.writelines(files_to_create)
 
         self.logger.info(f"Saving benchmark workflow: {json_path}")
-        self.workflow.write_json(json_path)
+        self.workflow.write_json(json_path, indent=4 if pretty else None)
 
         return json_path
 
@@ -238,7 +251,9 @@ class WorkflowBenchmark:
                          data: Optional[Union[int, Dict[str, str]]] = None,
                          mem: Optional[float] = None,
                          lock_files_folder: Optional[pathlib.Path] = None,
-                         regenerate: Optional[bool] = True) -> pathlib.Path:
+                         regenerate: Optional[bool] = True,
+                         preallocate_data: Optional[bool] = False,
+                         pretty: Optional[bool] = False) -> pathlib.Path:
         """Create a workflow benchmark.
 
         :param save_dir: Folder to generate the workflow benchmark JSON instance and input data files.
@@ -259,6 +274,11 @@ class WorkflowBenchmark:
         :type lock_files_folder: Optional[pathlib.Path]
         :param regenerate: Whether to regenerate the workflow tasks
         :type regenerate: Optional[bool]
+        :param preallocate_data: Whether to only preallocate disk space for the workflow input data files
+                                 (files read back as zeros) instead of filling them with random bytes.
+        :type preallocate_data: Optional[bool]
+        :param pretty: Whether to write an indented (human-readable) workflow benchmark JSON instance.
+        :type pretty: Optional[bool]
 
         :return: The path to the workflow benchmark JSON instance.
         :rtype: pathlib.Path
@@ -268,35 +288,78 @@ class WorkflowBenchmark:
 
         if not self.workflow or regenerate:
             self.logger.debug("Generating workflow")
-            generator = WorkflowGenerator(
-                self.recipe.from_num_tasks(self.num_tasks))
-            self.workflow = generator.build_workflow()
+            self.workflow = self._generate_workflow()
             self.workflow.name = f"{self.workflow.name.split('-')[0]}-Benchmark"
         json_path = save_dir.joinpath(
             f"{self.workflow.name.lower()}-{self.num_tasks}").with_suffix(".json")
 
-        cores, lock = self._creating_lock_files(lock_files_folder)
-        for task in self.tasks.values():
+        lock_params = self._lock_files_params(lock_files_folder)
+        percent_cpu_of = _category_lookup(percent_cpu)
+        cpu_work_of = _category_lookup(cpu_work)
+        gpu_work_of = _category_lookup(gpu_work)
+        for task in self.workflow.tasks.values():
+            task_cpu_work = cpu_work_of(task.category)
             self._set_argument_parameters(
                 task,
-                percent_cpu,
-                cpu_work,
-                gpu_work,
+                percent_cpu_of(task.category) if task_cpu_work else None,
+                task_cpu_work,
+                gpu_work_of(task.category),
                 time,
                 mem,
-                lock_files_folder,
-                cores,
-                lock
+                lock_params
             )
             task.files = []
 
-        self._create_data_footprint(data, save_dir)
+        self._create_data_footprint(data, save_dir, preallocate_data)
 
         self.logger.info(f"Saving benchmark workflow: {json_path}")
-        self.workflow.write_json(json_path)
+        self.workflow.write_json(json_path, indent=4 if pretty else None)
 
         return json_path
 
+    def _generate_workflow(self) -> Workflow:
+        """
+        Generate a workflow from the recipe. When the ``WFCOMMONS_WORKFLOW_CACHE`` environment variable
+        is set to ``1``, generated workflows are cached (in ``~/.cache/wfcommons``) and reused for the
+        same recipe and number of tasks.
+
+        :return: The generated workflow.
+        :rtype: Workflow
+        """
+        if os.environ.get("WFCOMMONS_WORKFLOW_CACHE") != "1":
+            return WorkflowGenerator(self.recipe.from_num_tasks(self.num_tasks)).build_workflow()
+
+        key = f"{__version__}:{self.recipe.__module__}.{self.recipe.__qualname__}:{self.num_tasks}"
+        cache_file = _WORKFLOW_CACHE_DIR.expanduser().joinpath(
+            f"{hashlib.sha1(key.encode()).hexdigest()}.pkl")
+        if cache_file.is_file():
+            try:
+                with cache_file.open("rb") as fp:
+                    workflow = pickle.load(fp)
+                self.logger.debug(f"Using cached workflow: {cache_file}")
+                return workflow
+            except Exception as e:
+                # e.g., a truncated or stale cache file, which is regenerated below
+                self.logger.warning(f"Could not load cached workflow ({e}), regenerating it: {cache_file}")
+
+        workflow = WorkflowGenerator(self.recipe.from_num_tasks(self.num_tasks)).build_workflow()
+        try:
+            cache_file.parent.mkdir(exist_ok=True, parents=True)
+            # write to a temporary file that is atomically renamed, so concurrent or interrupted
+            # runs never leave a partially written cache file behind
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    pickle.dump(workflow, fp)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            self.logger.debug(f"Cached workflow: {cache_file}")
+        except OSError as e:
+            self.logger.warning(f"Could not cache workflow ({e}): {cache_file}")
+        return workflow
+
     def _creating_lock_files(self, lock_files_folder: Optional[pathlib.Path]) -> Tuple[pathlib.Path, pathlib.Path]:
         """
         Creating the lock files
@@ -317,24 +380,31 @@ class WorkflowBenchmark:
                                 f"You will need to create them manually: 'cores.txt.lock' and 'cores.txt'")
             return None, None
 
+    def _lock_files_params(self, lock_files_folder: Optional[pathlib.Path]) -> List[str]:
+        """
+        Creating the lock files and the corresponding arguments (shared by all tasks)
+        """
+        if not lock_files_folder:
+            return []
+        lock, cores = self._creating_lock_files(lock_files_folder)
+        return [f"--path-lock {lock}", f"--path-cores {cores}"]
+
     def _set_argument_parameters(self,
                                  task: Task,
-                                 percent_cpu: Union[float, Dict[str, float]],
-                                 cpu_work: Union[int, Dict[str, int]],
-                                 gpu_work: Union[int, Dict[str, int]],
+                                 percent_cpu: Optional[float],
+                                 cpu_work: Optional[int],
+                                 gpu_work: Optional[int],
                                  time: Optional[int],
                                  mem: Optional[float],
-                                 lock_files_folder: Optional[pathlib.Path],
-                                 cores: Optional[pathlib.Path],
-                                 lock: Optional[pathlib.Path]) -> None:
+                                 lock_params: List[str]) -> None:
         """
         Setting the parameters for the arguments section of the JSON
         """
         params = []
 
-        cpu_params = self._generate_task_cpu_params(task, percent_cpu, cpu_work, lock_files_folder, cores, lock)
+        cpu_params = self._generate_task_cpu_params(percent_cpu, cpu_work, lock_params)
         params.extend(cpu_params)
-        gpu_params = self._generate_task_gpu_params(task, gpu_work)
+        gpu_params = self._generate_task_gpu_params(gpu_work)
         params.extend(gpu_params)
 
         if mem:
@@ -350,62 +420,51 @@ class WorkflowBenchmark:
         task.args.extend(params)
 
     def _generate_task_cpu_params(self,
-                                  task: Task,
-                                  percent_cpu: Union[float, Dict[str, float]],
-                                  cpu_work: Union[int, Dict[str, int]],
-                                  lock_files_folder: Optional[pathlib.Path],
-                                  cores: Optional[pathlib.Path],
-                                  lock: Optional[pathlib.Path]) -> List[str]:
+                                  percent_cpu: Optional[float],
+                                  cpu_work: Optional[int],
+                                  lock_params: List[str]) -> List[str]:
         """
         Setting cpu arguments if cpu benchmark requested
         """
         if not cpu_work:
             return []
 
-        _percent_cpu = percent_cpu[task.category] if isinstance(
-            percent_cpu, dict) else percent_cpu
-        _cpu_work = cpu_work[task.category] if isinstance(
-            cpu_work, dict) else cpu_work
-
-        params = [f"--percent-cpu {_percent_cpu}", f"--cpu-work {int(_cpu_work)}"]
-
-        if lock_files_folder:
-            params.extend([f"--path-lock {lock}",
-                           f"--path-cores {cores}"])
+        params = [f"--percent-cpu {percent_cpu}", f"--cpu-work {int(cpu_work)}"]
+        params.extend(lock_params)
         return params
 
-    def _generate_task_gpu_params(self, task: Task, gpu_work: Union[int, Dict[str, int]]) -> List[str]:
+    def _generate_task_gpu_params(self, gpu_work: Optional[int]) -> List[str]:
         """
         Setting gpu arguments if gpu benchmark requested
         """
         if not gpu_work:
             return []
-        _gpu_work = gpu_work[task.category] if isinstance(
-            gpu_work, dict) else gpu_work
 
-        return [f"--gpu-work {_gpu_work}"]
+        return [f"--gpu-work {gpu_work}"]
 
-    def _create_data_footprint(self, data: Optional[Union[int, Dict[str, str]]], save_dir: pathlib.Path) -> None:
+    def _create_data_footprint(self,
+                               data: Optional[Union[int, Dict[str, str]]],
+                               save_dir: pathlib.Path,
+                               preallocate_data: Optional[bool] = False) -> None:
         """
         task's data footprint provided as individual data input size (JSON file)
         """
+        root_tasks = [task for task in self.workflow.tasks.values() if not self.workflow.tasks_parents[task.name]]
+
         if isinstance(data, dict):
             outputs = self._output_files(data)
             for task in self.workflow.tasks.values():
-                outputs_file_size = {}
-                for child, data_size in outputs[task.name].items():
-                    outputs_file_size[f"{task.name}_{child}_output.txt"] = data_size
-
-                task.args.extend([f"--out {outputs_file_size}"])
+                outputs_file_size = {f"{task.name}_{child}_output.txt": data_size
+                                     for child, data_size in outputs[task.name].items()}
+                self._add_output_files(task, outputs_file_size)
 
-            self._add_output_files(outputs)
             self._add_input_files(outputs, data)
             self.logger.debug("Generating system files.")
-            self._generate_data_for_root_nodes(save_dir, data)
+            self._generate_data_for_root_nodes(save_dir, data, root_tasks, preallocate_data)
 
         # data footprint provided as an integer
         elif isinstance(data, int):
-            num_sys_files, num_total_files = self._calculate_input_files()
+            num_sys_files, num_total_files = self._calculate_input_files(root_tasks)
             self.logger.debug(
                 f"Number of input files to be created by the system: {num_sys_files}")
             self.logger.debug(
@@ -415,18 +474,11 @@ class WorkflowBenchmark:
                 f"Every input/output file is of size: {file_size}")
 
             for task in self.workflow.tasks.values():
-                output = {f"{task.name}_output.txt": file_size}
-                task.args.extend([f"--out {output}"])
-                outputs = {}
-                if self.workflow.tasks_children[task.name]:
-                    outputs.setdefault(task.name, {})
-                    for child in self.workflow.tasks_children[task.name]:
-                        outputs[task.name][child] = file_size
-
-            self._add_output_files(file_size)
-            self._add_input_files(outputs, file_size)
+                self._add_output_files(task, {f"{task.name}_output.txt": file_size})
+
+            self._add_input_files(None, file_size)
             self.logger.debug("Generating system files.")
-            self._generate_data_for_root_nodes(save_dir, file_size)
+            self._generate_data_for_root_nodes(save_dir, file_size, root_tasks, preallocate_data)
 
     def _output_files(self, data: Dict[str, str]) -> Dict[str, Dict[str, int]]:
         """
@@ -452,81 +504,73 @@ class WorkflowBenchmark:
 
         return output_files
 
-    def _calculate_input_files(self):
+    def _calculate_input_files(self, root_tasks: List[Task]) -> Tuple[int, int]:
         """
         Calculate total number of files needed.
         This mehtod is used if the user provides total datafootprint.
-        """
-        tasks_need_input = 0
-        tasks_dont_need_input = 0
 
-        for task in self.workflow.tasks.values():
-            parents = self.workflow.tasks_parents[task.name]
-            if not parents:
-                tasks_need_input += 1
-            else:
-                tasks_dont_need_input += 1
+        :param root_tasks: The workflow tasks without parents.
+        :type root_tasks: List[Task]
+
+        :return: The number of input files to be created by the system and the total number of files.
+        :rtype: Tuple[int, int]
+        """
+        tasks_need_input = len(root_tasks)
+        tasks_dont_need_input = len(self.workflow.tasks) - tasks_need_input
 
         total_num_files = tasks_need_input * 2 + tasks_dont_need_input
 
         return tasks_need_input, total_num_files
 
-    def _add_output_files(self, output_files: Union[int, Dict[str, Dict[str, int]]]) -> None:
+    @staticmethod
+    def _add_output_files(task: Task, output_files: Dict[str, int]) -> None:
         """
-        Add output files when input data was offered by the user.
+        Add the output files of a task, both as task argument and as task files.
 
-        :param output_files:
-        :type wf: Union[int, Dict[str, Dict[str, int]]]
+        :param task: The workflow task.
+        :type task: Task
+        :param output_files: Output file sizes indexed by file name.
+        :type output_files: Dict[str, int]
         """
-        for task in self.workflow.tasks.values():
-            if isinstance(output_files, Dict):
-                for child, file_size in output_files[task.name].items():
-                    task.files.append(
-                        File(f"{task.name}_{child}_output.txt", file_size, FileLink.OUTPUT))
-            elif isinstance(output_files, int):
-                task.files.append(
-                    File(f"{task.name}_output.txt", output_files, FileLink.OUTPUT))
+        task.args.append(f"--out {output_files}")
+        task.files.extend([File(name, size, FileLink.OUTPUT) for name, size in output_files.items()])
 
-    def _add_input_files(self, output_files: Dict[str, Dict[str, str]], data: Union[int, Dict[str, str]]) -> None:
+    def _add_input_files(self,
+                         output_files: Optional[Dict[str, Dict[str, str]]],
+                         data: Union[int, Dict[str, str]]) -> None:
         """
         Add input files when input data was offered by the user.
 
-        :param output_files:
-        :type wf: Dict[str, Dict[str, str]]
+        :param output_files: Output files sizes per task and child (only used when data is a dictionary).
+        :type output_files: Optional[Dict[str, Dict[str, str]]]
         :param data:
         :type data: Union[int, Dict[str, str]]
         """
+        # map each task to the output files sizes of its parents
         input_files = {}
-        for parent, children in output_files.items():
-            for child, file_size in children.items():
-                input_files.setdefault(child, {})
-                input_files[child][parent] = file_size
+        if isinstance(data, Dict):
+            for parent, children in output_files.items():
+                for child, file_size in children.items():
+                    input_files.setdefault(child, {})
+                    input_files[child][parent] = file_size
 
         for task in self.workflow.tasks.values():
-            inputs = []
             if not self.workflow.tasks_parents[task.name]:
-                task.files.append(
-                    File(f"{task.name}_input.txt",
-                         data[task.category] if isinstance(
-                             data, Dict) else data,
-                         FileLink.INPUT))
-                inputs.append(f'{task.name}_input.txt')
+                inputs = {f"{task.name}_input.txt": data[task.category] if isinstance(data, Dict) else data}
+            elif isinstance(data, Dict):
+                inputs = {f"{parent}_{task.name}_output.txt": file_size
+                          for parent, file_size in input_files[task.name].items()}
             else:
-                if isinstance(data, Dict):
-                    for parent, file_size in input_files[task.name].items():
-                        task.files.append(
-                            File(f"{parent}_{task.name}_output.txt", file_size, FileLink.INPUT))
-                        inputs.append(f"{parent}_{task.name}_output.txt")
-
-                elif isinstance(data, int):
-                    for parent in self.workflow.tasks_parents[task.name]:
-                        task.files.append(
-                            File(f"{parent}_output.txt", data, FileLink.INPUT))
-                        inputs.append(f"{parent}_output.txt")
+                inputs = {f"{parent}_output.txt": data for parent in self.workflow.tasks_parents[task.name]}
 
+            task.files.extend([File(name, size, FileLink.INPUT) for name, size in inputs.items()])
             task.args.extend(inputs)
 
-    def _generate_data_for_root_nodes(self, save_dir: pathlib.Path, data: Union[int, Dict[str, str]]) -> None:
+    def _generate_data_for_root_nodes(self,
+                                      save_dir: pathlib.Path,
+                                      data: Union[int, Dict[str, str]],
+                                      root_tasks: List[Task],
+                                      preallocate_data: Optional[bool] = False) -> None:
         """
         Generate workflow's input data for root nodes based on user's input.
 
@@ -534,16 +578,23 @@ class WorkflowBenchmark:
         :type save_dir: pathlib.Path
         :param data:
         :type data: Dict[str, str]
+        :param root_tasks: The workflow tasks without parents.
+        :type root_tasks: List[Task]
+        :param preallocate_data: Whether to only preallocate the files instead of filling them with random bytes.
+        :type preallocate_data: Optional[bool]
         """
-        for task in self.workflow.tasks.values():
-            if not self.workflow.tasks_parents[task.name]:
-                file_size = data[task.category] if isinstance(
-                    data, Dict) else data
-                file = save_dir.joinpath(f"{task.name}_input.txt")
-                if not file.is_file():
-                    with open(file, 'wb') as fp:
-                        fp.write(os.urandom(int(file_size)))
-                    self.logger.debug(f"Created file: {str(file)}")
+        existing_files = _list_files(save_dir)
+        files: List[Tuple[pathlib.Path, int]] = []
+        for task in root_tasks:
+            file_size = data[task.category] if isinstance(
+                data, Dict) else data
+            file_name = f"{task.name}_input.txt"
+            if file_name not in existing_files:
+                files.append((save_dir.joinpath(file_name), int(file_size)))
+
+        generate_files(files, preallocate_data)
+        for file, _ in files:
+            self.logger.debug(f"Created file: {str(file)}")
 
     def generate_input_file(self, path: pathlib.Path) -> None:
         """
@@ -552,9 +603,7 @@ class WorkflowBenchmark:
         :param path:
         :type path: pathlib.Path
         """
-        generator = WorkflowGenerator(
-            self.recipe.from_num_tasks(self.num_tasks))
-        workflow = generator.build_workflow()
+        workflow = self._generate_workflow()
 
         defaults = {
             "percent_cpu": 0.6,
@@ -569,12 +618,10 @@ class WorkflowBenchmark:
             "data": {}
 
         }
-        for node in workflow.nodes:
-            task: Task = workflow.nodes[node]['task']
-            task_type = task.name.split("_0")[0]
-
-            for key in inputs.keys():
-                inputs[key].setdefault(task_type, defaults[key])
+        # parameters are keyed by task category, as looked up by create_benchmark
+        task_types = dict.fromkeys(task.category for task in workflow.tasks.values())
+        for key in inputs.keys():
+            inputs[key] = {task_type: defaults[key] for task_type in task_types}
 
         path.parent.mkdir(exist_ok=True, parents=True)
         path.write_text(json.dumps(inputs, indent=2))
@@ -591,54 +638,63 @@ class WorkflowBenchmark:
         """
         self.logger.debug("Running")
         try:
-            wf = json.loads(json_path.read_text())
-            with save_dir.joinpath(f"run.txt").open("w+") as fp:
-                has_executed: Set[str] = set()
-                procs: List[subprocess.Popen] = []
-                while len(has_executed) < len(wf["workflow"]["tasks"]):
-                    for task in wf["workflow"]["tasks"]:
-                        if task["name"] in has_executed:
-                            continue
-                        ready_to_execute = all([
-                            this_dir.joinpath(input_file["name"]).exists()
-                            for input_file in task["files"]
-                            if input_file["link"] == "input"
-                        ])
-                        if not ready_to_execute:
+            wf = read_json(json_path)
+            tasks = {task["name"]: task for task in wf["workflow"]["tasks"]}
+
+            # tasks are launched as soon as all their parents have completed
+            pending_parents: Dict[str, int] = {name: len(task["parents"]) for name, task in tasks.items()}
+            ready: Deque[str] = deque(name for name, count in pending_parents.items() if count == 0)
+            running: Dict[Future, str] = {}
+            failed: List[str] = []
+
+            with save_dir.joinpath(f"run.txt").open("w+") as fp, \
+                    ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+
+                def _run_task(task: Dict[str, Any]) -> int:
+                    program = ["time", "python", task["command"]["program"],
+                               *_command_line_arguments(task["command"]["arguments"])]
+                    folder = pathlib.Path(this_dir.joinpath(f"wfbench_execution/{uuid.uuid4()}"))
+                    folder.mkdir(exist_ok=True, parents=True)
+                    return subprocess.run(program, stdout=fp, stderr=fp, cwd=folder).returncode
+
+                while ready or running:
+                    while ready:
+                        task_name = ready.popleft()
+                        running[executor.submit(_run_task, tasks[task_name])] = task_name
+
+                    # block until any task completes, then release its children
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        task_name = running.pop(future)
+                        returncode = future.result()
+                        if returncode != 0:
+                            # children of a failed task are never released, so its descendants are skipped
+                            self.logger.error(f"Task {task_name} failed with exit status {returncode}")
+                            failed.append(task_name)
                             continue
-                        has_executed.add(task["name"])
-
-                        executable = task["command"]["program"]
-                        arguments = task["command"]["arguments"]
-                        if "--out" in arguments:
-                            files = assigning_correct_files(task)
-                            program = ["time", "python",
-                                       executable, *arguments, *files]
-                        else:
-                            program = ["time", "python",
-                                       executable, *arguments]
-                        folder = pathlib.Path(this_dir.joinpath(
-                            f"wfbench_execution/{uuid.uuid4()}"))
-                        folder.mkdir(exist_ok=True, parents=True)
-                        os.chdir(str(folder))
-                        procs.append(subprocess.Popen(
-                            program, stdout=fp, stderr=fp))
-                        os.chdir("../..")
-
-                    time.sleep(1)
-                for proc in procs:
-                    proc.wait()
-            cleanup_sys_files()
+                        for child in tasks[task_name]["children"]:
+                            pending_parents[child] -= 1
+                            if pending_parents[child] == 0:
+                                ready.append(child)
+
+            if failed:
+                skipped = sum(1 for count in pending_parents.values() if count > 0)
+                self.logger.error(f"{len(failed)} task(s) failed, {skipped} dependent task(s) were not run")
+            cleanup_sys_files(this_dir)
 
         except Exception as e:
             subprocess.Popen(["killall", "stress-ng"])
-            cleanup_sys_files()
+            cleanup_sys_files(this_dir)
             import traceback
             traceback.print_exc()
             raise FileNotFoundError("Not able to find the executable.")
 
 
-def generate_sys_data(num_files: int, file_total_size: int, task_name: List[str], save_dir: pathlib.Path) -> None:
+def generate_sys_data(num_files: int,
+                      file_total_size: int,
+                      task_name: List[str],
+                      save_dir: pathlib.Path,
+                      preallocate_data: Optional[bool] = False) -> None:
     """Generate workflow's input data
 
     :param num_files:
@@ -647,27 +703,99 @@ def generate_sys_data(num_files: int, file_total_size: int, task_name: List[str]
     :type file_total_size: int
     :param save_dir: Folder to generate the workflow benchmark's input data files.
     :type save_dir: pathlib.Path
+    :param preallocate_data: Whether to only preallocate the files instead of filling them with random bytes.
+    :type preallocate_data: Optional[bool]
+    """
+    files = [(save_dir.joinpath(f"{name}_input.txt"), file_total_size) for name in task_name]
+    generate_files(files, preallocate_data)
+    for file, _ in files:
+        print(f"Created file: {file}")
+
+
+def _category_lookup(value: Union[Any, Dict[str, Any]]) -> Callable[[str], Any]:
+    """
+    Get a function that returns the value of a benchmark parameter for a task category, where the
+    parameter is either a single value for all tasks or a dictionary of values per task category.
+
+    :param value: The benchmark parameter value.
+    :type value: Union[Any, Dict[str, Any]]
+
+    :return: A function that takes a task category and returns the parameter value for it (None for
+             an empty dictionary, i.e., the benchmark is not requested).
+    :rtype: Callable[[str], Any]
+    """
+    if isinstance(value, dict):
+        return value.__getitem__ if value else lambda category: None
+    return lambda category: value
+
+
+def _runtime_factor_lookup(value: Union[Any, Dict[str, Any]],
+                           task_max_runtimes: Dict[str, float],
+                           max_runtime: float) -> Callable[[Task], float]:
+    """
+    Get a function that returns the factor by which a benchmark parameter is scaled for a task. A
+    parameter given per task category is scaled by the task's runtime within its category, while a
+    single value is scaled by the task's runtime within the workflow.
+
+    :param value: The benchmark parameter value.
+    :type value: Union[Any, Dict[str, Any]]
+    :param task_max_runtimes: The maximum task runtime per task category.
+    :type task_max_runtimes: Dict[str, float]
+    :param max_runtime: The maximum task runtime in the workflow.
+    :type max_runtime: float
+
+    :return: A function that takes a task and returns the scaling factor for it.
+    :rtype: Callable[[Task], float]
+    """
+    if isinstance(value, dict):
+        return lambda task: task.runtime / task_max_runtimes[task.category]
+    return lambda task: task.runtime / max_runtime
+
+
+def _list_files(folder: pathlib.Path) -> Set[str]:
+    """
+    List the names of the regular files in a folder with a single directory scan
+    (instead of one stat call per file).
+
+    :param folder: The folder to be scanned.
+    :type folder: pathlib.Path
+
+    :return: The names of the files in the folder.
+    :rtype: Set[str]
+    """
+    with os.scandir(folder) as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
+
+def _command_line_arguments(arguments: List[str]) -> List[str]:
+    """
+    Split the task arguments of the form '--option value' into separate command-line arguments.
+
+    :param arguments: The task arguments (as in the workflow benchmark JSON instance).
+    :type arguments: List[str]
+
+    :return: The list of command-line arguments.
+    :rtype: List[str]
+    """
+    cmd_args = []
+    for arg in arguments:
+        if arg.startswith("--"):
+            cmd_args.extend(arg.split(" ", 1))
+        else:
+            cmd_args.append(arg)
+    return cmd_args
+
+
+def cleanup_sys_files(folder: Optional[pathlib.Path] = None) -> None:
+    """
+    Remove files already used
+
+    :param folder: Folder where the files are located (current working directory if None).
+    :type folder: Optional[pathlib.Path]
     """
-    for _ in range(num_files):
-        for name in task_name:
-            file = f"{save_dir.joinpath(f'{name}_input.txt')}"
-            with open(file, 'wb') as fp:
-                fp.write(os.urandom(file_total_size))
-            print(f"Created file: {file}")
-
-
-def assigning_correct_files(task: Dict[str, str]) -> List[str]:
-    files = []
-    for file in task["files"]:
-        if file["link"] == "input":
-            files.append(file["name"])
-    return files
-
-
-def cleanup_sys_files() -> None:
-    """Remove files already used"""
-    input_files = glob.glob("*input*.txt")
-    output_files = glob.glob("*output.txt")
+    root_dir = folder if folder else os.curdir
+    input_files = glob.glob(os.path.join(root_dir, "*input*.txt"))
+    output_files = glob.glob(os.path.join(root_dir, "*output.txt"))
     all_files = input_files + output_files
     for t in all_files:
         os.remove(t)
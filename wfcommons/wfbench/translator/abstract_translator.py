@@ -9,15 +9,15 @@
 # (at your option) any later version.
 
 import logging
-import os
 import pathlib
 import shutil
 
 from abc import ABC, abstractmethod
-from typing import Optional, Union
+from typing import List, Optional, Union
 
-from ...common import FileLink, Task, Workflow
+from ...common import FileLink, Workflow
 from ...wfinstances.instance import Instance
+from ...utils import generate_files
 
 
 this_dir = pathlib.Path(__file__).resolve().parent
@@ -44,33 +44,18 @@ class Translator(ABC):
             instance = Instance(workflow, logger=logger)
             self.workflow = instance.workflow
 
-        self.workflow.write_json()
-
         # find all tasks
         self.tasks = {}
         for task in self.workflow.nodes.data():
             self.tasks[task[0]] = task[1]["task"]
 
         # find root, parents, and children tasks
-        self.root_task_names = []
-        self.task_parents = {}
-        self.task_children = {}
-        for task in self.workflow.workflow_json["workflow"]["tasks"]:
-            if len(task["parents"]) == 0:
-                if task["name"] not in self.root_task_names:
-                    self.root_task_names.append(task["name"])
-                    self.task_parents.setdefault(task['name'], [])
-            else:
-                for parent in task["parents"]:
-                    self.task_parents.setdefault(task['name'], [])
-                    self.task_parents[task['name']].append(parent)
-            
-            if len(task["children"]) == 0:
-                self.task_children.setdefault(task['name'], [])
-            else:
-                for child in task["children"]:
-                    self.task_children.setdefault(task['name'], [])
-                    self.task_children[task['name']].append(child)
+        self.task_parents = {task_name: [] for task_name in self.tasks}
+        self.task_children = {task_name: [] for task_name in self.tasks}
+        for parent, child in self.workflow.edges:
+            self.task_parents[child].append(parent)
+            self.task_children[parent].append(child)
+        self.root_task_names = [task_name for task_name, parents in self.task_parents.items() if not parents]
 
     @abstractmethod
     def translate(self, output_folder: pathlib.Path) -> None:
@@ -100,16 +85,15 @@ class Translator(ABC):
         :param output_folder: The path to the folder in which the workflow benchmark will be generated.
         :type output_folder: pathlib.Path
         """
-        generated_files = []
+        input_files = {}
         data_folder = output_folder.joinpath("data")
         data_folder.mkdir()
         for task_name in self.root_task_names:
             task = self.tasks[task_name]
             for file in task.files:
-                if file.name not in generated_files and file.link == FileLink.INPUT:
-                    generated_files.append(file.name)
-                    with open(data_folder.joinpath(file.name), "wb") as fp:
-                        fp.write(os.urandom(int(file.size)))
+                if file.link == FileLink.INPUT:
+                    input_files.setdefault(file.name, int(file.size))
+        generate_files([(data_folder.joinpath(name), size) for name, size in input_files.items()])
 
     def _write_output_file(self, contents: str, output_file_path: pathlib.Path) -> None:
         """
@@ -121,42 +105,33 @@ class Translator(ABC):
         :type output_file_path: pathlib.Path
         """
         # file will be written to the same folder as for the original JSON instance.
-        with open(output_file_path, "w") as out:
-            out.write(contents)
+        # the contents are encoded at once, so that they are written with a single (unbuffered) write
+        with open(output_file_path, "wb") as out:
+            out.write(contents.encode("utf-8"))
         self.logger.info(f"Translated content written to '{output_file_path}'")
 
-    def _find_children(self, task_name: str) -> list[Task]:
+    def _find_children(self, task_name: str) -> List[str]:
         """
         Find the children for a specific task.
 
         :param task_name: The task name.
         :type task_name: str
 
-        :return: List of task's children.
-        :rtype: list[Task]
+        :return: List of task's children names.
+        :rtype: List[str]
         """
         self.logger.debug(f"Finding children for task '{task_name}'")
-        children = None
-        for node in self.instance.instance["workflow"]["tasks"]:
-            if node["name"] == task_name:
-                children = node["children"]
-
-        return children
+        return self.task_children.get(task_name)
 
-    def _find_parents(self, task_name: str) -> list[Task]:
+    def _find_parents(self, task_name: str) -> List[str]:
         """
         Find the parents for a specific task.
 
         :param task_name: The task name.
         :type task_name: str
 
-        :return: List of task's parents.
-        :rtype: list[Task]
+        :return: List of task's parents names.
+        :rtype: List[str]
         """
         self.logger.debug(f"Finding parents for task '{task_name}'")
-        parents = None
-        for node in self.instance.instance["workflow"]["tasks"]:
-            if node["name"] == task_name:
-                parents = node["parents"]
-
-        return parents
+        return self.task_parents.get(task_name)
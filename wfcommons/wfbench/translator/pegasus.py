@@ -8,13 +8,17 @@
 # the Free Software Foundation, either version 3 of the License, or
 # (at your option) any later version.
 
+import logging
+import os
 import pathlib
 
 from logging import Logger
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple, Union
 
 from .abstract_translator import Translator
-from ...common import FileLink, Workflow
+from ...common import FileLink, Task, Workflow
+
+this_dir = pathlib.Path(__file__).resolve().parent
 
 
 class PegasusTranslator(Translator):
@@ -33,14 +37,8 @@ class PegasusTranslator(Translator):
         """Create an object of the translator."""
         super().__init__(workflow, logger)
 
-        self.script = "import os\n" \
-                      "from Pegasus.api import *\n\n\n" \
-                      "def which(file):\n" \
-                      "    for path in os.environ['PATH'].split(os.pathsep):\n" \
-                      "        if os.path.exists(os.path.join(path, file)):\n" \
-                      "            return os.path.join(path, file)\n" \
-                      "    return None\n\n\n"
-        self.parsed_tasks = []
+        self.script_file: Optional[TextIO] = None
+        self.parsed_tasks: Set[str] = set()
         self.tasks_map = {}
         self.task_counter = 1
 
@@ -53,61 +51,82 @@ class PegasusTranslator(Translator):
         :param tasks_priorities: Priorities to be assigned to tasks.
         :type tasks_priorities: Optional[Dict[str, int]]
         """
-        # overall workflow
-        self.script += f"wf = Workflow('{self.workflow.name}', infer_dependencies=True)\n" \
-                       "tc = TransformationCatalog()\n" \
-                       "rc = ReplicaCatalog()\n\n"
-        self.script += "task_output_files = {}\n\n"
-
-        # transformation catalog
-        transformations = []
-
-        # cpu-benchmark
-        self.script += "t_cpu_benchmark = Transformation('cpu-benchmark', site='local',\n" \
-                       "pfn=os.getcwd() + '/cpu-benchmark', is_stageable=True)\n" \
-                       "tc.add_transformations(t_cpu_benchmark)\n\n"
-
-        # tasks' programs
-        for task in self.tasks.values():
-            if task.category not in transformations:
-                transformations.append(task.category)
-                self.script += f"transformation_path = which('{task.program}')\n" \
-                               "if transformation_path is None:\n" \
-                               f"    raise RuntimeError('Unable to find {task.program}')\n" \
-                               f"transformation = Transformation('{task.category}', site='local',\n" \
-                               f"                                pfn='{task.program}',\n" \
-                               "                                is_stageable=True)\n" \
-                               "transformation.add_env(PATH='/usr/bin:/bin:.')\n" \
-                               "transformation.add_profiles(Namespace.CONDOR, 'request_disk', '10')\n" \
-                               "transformation.add_requirement(t_cpu_benchmark)\n" \
-                               "tc.add_transformations(transformation)\n\n"
-
-        # adding tasks
-        for task_name in self.root_task_names:
-            self._add_task(task_name, tasks_priorities=tasks_priorities)
-            # input file
-            task = self.tasks[task_name]
-            for file in task.files:
-                if file.link == FileLink.INPUT:
-                    self.script += f"in_file_{self.task_counter} = File('{file.name}')\n"
-                    self.script += f"rc.add_replica('local', '{file.name}', 'file://' + os.getcwd() + " \
-                                   f"'/data/{file.name}')\n"
-                    self.script += f"{self.tasks_map[task_name]}.add_inputs(in_file_{self.task_counter})\n" \
-                                   f"print('Using input data: ' + os.getcwd() + '/data/{file.name}')\n"
-
-        self.script += "\n"
-
-        # write out the workflow
-        self.script += "wf.add_replica_catalog(rc)\n" \
-                       "wf.add_transformation_catalog(tc)\n" \
-                       f"wf.write('{self.workflow.name}-benchmark-workflow.yml')\n"
-
-        # write script to file
-        self._write_output_file(self.script, output_file_name)
+        with open(this_dir.joinpath("templates/pegasus_template.py")) as fp:
+            template_head, template_tail = fp.read().split("# Generated code goes here\n")
+
+        # the generated code is streamed to a temporary file that is renamed once complete, so a
+        # failed translation never leaves a partial script behind
+        output_file_name = pathlib.Path(output_file_name)
+        tmp_file_name = output_file_name.with_name(f".{output_file_name.name}.tmp")
+        try:
+            with open(tmp_file_name, "w", encoding="utf-8", buffering=65536) as script_file:
+                self.script_file = script_file
+                self.script_file.write(template_head)
+
+                # overall workflow
+                self.script_file.write(f"wf = Workflow('{self.workflow.name}', infer_dependencies=True)\n"
+                                       "tc = TransformationCatalog()\n"
+                                       "rc = ReplicaCatalog()\n\n"
+                                       "task_output_files = {}\n\n")
+
+                # transformation catalog
+                transformations = set()
+
+                # cpu-benchmark
+                self.script_file.write("t_cpu_benchmark = Transformation('cpu-benchmark', site='local',\n"
+                                       "pfn=os.getcwd() + '/cpu-benchmark', is_stageable=True)\n"
+                                       "tc.add_transformations(t_cpu_benchmark)\n\n")
+
+                # tasks' programs
+                for task in self.tasks.values():
+                    if task.category not in transformations:
+                        transformations.add(task.category)
+                        self.script_file.write(f"transformation_path = which('{task.program}')\n"
+                                               "if transformation_path is None:\n"
+                                               f"    raise RuntimeError('Unable to find {task.program}')\n"
+                                               f"transformation = Transformation('{task.category}', site='local',\n"
+                                               f"                                pfn='{task.program}',\n"
+                                               "                                is_stageable=True)\n"
+                                               "transformation.add_env(PATH='/usr/bin:/bin:.')\n"
+                                               "transformation.add_profiles(Namespace.CONDOR, 'request_disk', '10')\n"
+                                               "transformation.add_requirement(t_cpu_benchmark)\n"
+                                               "tc.add_transformations(transformation)\n\n")
+
+                # adding tasks
+                print_inputs = self.logger.isEnabledFor(logging.DEBUG)
+                for task_name in self.root_task_names:
+                    self._add_task(task_name, tasks_priorities=tasks_priorities)
+                    # input file
+                    job_name = self.tasks_map[task_name]
+                    in_file = f"in_file_{self.task_counter}"
+                    for file in self.tasks[task_name].files:
+                        if file.link == FileLink.INPUT:
+                            self.script_file.write(f"{in_file} = File('{file.name}')\n"
+                                                   f"rc.add_replica('local', '{file.name}', 'file://' + os.getcwd() + "
+                                                   f"'/data/{file.name}')\n"
+                                                   f"{job_name}.add_inputs({in_file})\n")
+                            if print_inputs:
+                                self.script_file.write(f"print('Using input data: ' + os.getcwd() + '/data/{file.name}')\n")
+
+                # write out the workflow
+                self.script_file.write("\n"
+                                       "wf.add_replica_catalog(rc)\n"
+                                       "wf.add_transformation_catalog(tc)\n"
+                                       f"wf.write('{self.workflow.name}-benchmark-workflow.yml')\n")
+                self.script_file.write(template_tail)
+            os.replace(tmp_file_name, output_file_name)
+        except BaseException:
+            tmp_file_name.unlink(missing_ok=True)
+            raise
+        finally:
+            self.script_file = None
+        self.logger.info(f"Translated content written to '{output_file_name}'")
 
     def _add_task(self, task_name: str, parent_task: Optional[str] = None, tasks_priorities: Optional[Dict[str, int]] = None) -> None:
         """
-        Add a task and its dependencies to the workflow.
+        Add a task and its dependencies to the workflow. The task descendants are traversed
+        depth-first with an explicit stack, and the dependency of a task to its parent is
+        added once all of its children have been added.
 
         :param task_name: name of the task
         :type task_name: str
@@ -116,48 +135,81 @@ class PegasusTranslator(Translator):
         :param tasks_priorities: Priorities to be assigned to tasks.
         :type tasks_priorities: Optional[Dict[str, int]]
         """
-        if task_name not in self.parsed_tasks:
-            task = self.tasks[task_name]
-            job_name = f"job_{self.task_counter}"
-            self.script += f"{job_name} = Job('{task.category}', _id='{task_name}')\n" \
-                f"task_output_files.setdefault('{job_name}', [])\n"
-
-            # task priority
-            if tasks_priorities and task.category in tasks_priorities:
-                self.script += f"{job_name}.add_condor_profile(priority='{tasks_priorities[task.category]}')\n"
-
-            # find children
-            children = self.task_children[task_name]
-
-            # output file
-            for file in task.files:
-                if file.link == FileLink.OUTPUT:
-                    out_file = file.name
-                    # task.args.append(f"--out={out_file}")
-                    stage_out = "True" if len(children) == 0 else "False"
-                    self.script += f"out_file_{self.task_counter} = File('{out_file}')\n" \
-                        f"task_output_files['{job_name}'].append(out_file_{self.task_counter})\n" \
-                        f"{job_name}.add_outputs(out_file_{self.task_counter}, " \
-                        f"stage_out={stage_out}, register_replica={stage_out})\n"
-
-            # arguments
-            args = []
-            for a in task.args:
-                a = a.replace("'", "\"") if "--out" not in a else a.replace("{", "\"{").replace("}", "}\"").replace("'", "\\\\\"").replace(": ", ":")
-                args.append(a)
-            args = ", ".join(f"'{a}'" for a in args)
-            self.script += f"{job_name}.add_args({args})\n"
-
-            self.script += f"wf.add_jobs({job_name})\n\n"
-            self.task_counter += 1
-            self.parsed_tasks.append(task_name)
-            self.tasks_map[task_name] = job_name
-
-            for child_task_name in children:
-                self._add_task(child_task_name, job_name, tasks_priorities)
-
-        if parent_task:
-            self.script += f"if '{parent_task}' in task_output_files:\n" \
-                        f"    for f in task_output_files['{parent_task}']:\n" \
-                        f"        {self.tasks_map[task_name]}.add_inputs(f)\n" \
-                        f"wf.add_dependency({self.tasks_map[task_name]}, parents=[{parent_task}])\n\n"
+        # (task name, parent job name, iterator over the children still to be added)
+        stack: List[Tuple[str, Optional[str], Optional[Iterator[str]]]] = [(task_name, parent_task, None)]
+        while stack:
+            task_name, parent_task, children = stack.pop()
+            if children is None and task_name not in self.parsed_tasks:
+                self._add_job(task_name, tasks_priorities)
+                children = iter(self.task_children[task_name])
+
+            if children is not None:
+                child_task_name = next(children, None)
+                if child_task_name is not None:
+                    stack.append((task_name, parent_task, children))
+                    stack.append((child_task_name, self.tasks_map[task_name], None))
+                    continue
+
+            if parent_task:
+                job_name = self.tasks_map[task_name]
+                self.script_file.write(f"if '{parent_task}' in task_output_files:\n"
+                                       f"    for f in task_output_files['{parent_task}']:\n"
+                                       f"        {job_name}.add_inputs(f)\n"
+                                       f"wf.add_dependency({job_name}, parents=[{parent_task}])\n\n")
+
+    def _add_job(self, task_name: str, tasks_priorities: Optional[Dict[str, int]] = None) -> None:
+        """
+        Add the job of a task to the workflow.
+
+        :param task_name: name of the task
+        :type task_name: str
+        :param tasks_priorities: Priorities to be assigned to tasks.
+        :type tasks_priorities: Optional[Dict[str, int]]
+        """
+        task = self.tasks[task_name]
+        job_name = f"job_{self.task_counter}"
+        out_file = f"out_file_{self.task_counter}"
+        self.script_file.write(f"{job_name} = Job('{task.category}', _id='{task_name}')\n"
+                               f"task_output_files.setdefault('{job_name}', [])\n")
+
+        # task priority
+        if tasks_priorities and task.category in tasks_priorities:
+            self.script_file.write(f"{job_name}.add_condor_profile(priority='{tasks_priorities[task.category]}')\n")
+
+        # output file
+        stage_out = "False" if self.task_children[task_name] else "True"
+        for file in task.files:
+            if file.link == FileLink.OUTPUT:
+                self.script_file.write(f"{out_file} = File('{file.name}')\n"
+                                       f"task_output_files['{job_name}'].append({out_file})\n"
+                                       f"{job_name}.add_outputs({out_file}, "
+                                       f"stage_out={stage_out}, register_replica={stage_out})\n")
+
+        # arguments
+        args = ", ".join(f"'{a}'" for a in self._build_args(task))
+        self.script_file.write(f"{job_name}.add_args({args})\n"
+                               f"wf.add_jobs({job_name})\n\n")
+        self.task_counter += 1
+        self.parsed_tasks.add(task_name)
+        self.tasks_map[task_name] = job_name
+
+    @staticmethod
+    def _build_args(task: Task) -> List[str]:
+        """
+        Build the job arguments of a task (the task arguments are not modified).
+
+        :param task: The task.
+        :type task: Task
+
+        :return: The job arguments.
+        :rtype: List[str]
+        """
+        args = []
+        for a in task.args:
+            if "--out" in a:
+                # the output files dictionary is passed as a single JSON string
+                a = a.replace("{", "\"{").replace("}", "}\"").replace("'", "\\\\\"").replace(": ", ":")
+            else:
+                a = a.replace("'", "\"")
+            args.append(a)
+        return args
@@ -16,15 +16,17 @@ import time
 import json
 import signal
 import sys
-import pandas as pd
-
-from io import StringIO
 
 from filelock import FileLock
 from typing import List, Optional
 
 this_dir = pathlib.Path(__file__).resolve().parent
 
+try:
+    _URANDOM_FD: Optional[int] = os.open("/dev/urandom", os.O_RDONLY)
+except OSError:
+    _URANDOM_FD = None
+
 
 def lock_core(path_locked: pathlib.Path,
               path_cores: pathlib.Path) -> int:
@@ -133,8 +135,9 @@ def cpu_mem_benchmark(cpu_threads: Optional[int] = 5,
 def get_available_gpus():
     proc = subprocess.Popen(["nvidia-smi", "--query-gpu=utilization.gpu", "--format=csv"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     stdout, _ = proc.communicate()
-    df = pd.read_csv(StringIO(stdout.decode("utf-8")), sep=" ")
-    return df[df["utilization.gpu"] <= 5].index.to_list()
+    # the first line is the CSV header ("utilization.gpu [%]"), followed by one "<value> %" line per GPU
+    utilizations = [int(line.split()[0]) for line in stdout.decode("utf-8").splitlines()[1:] if line.strip()]
+    return [device for device, utilization in enumerate(utilizations) if utilization <= 5]
 
 def gpu_benchmark(work, device):
     gpu_prog = [f"CUDA_DEVICE_ORDER=PCI_BUS_ID CUDA_VISIBLE_DEVICES={device} {this_dir.joinpath('gpu-benchmark')} {work}"]
@@ -176,10 +179,40 @@ def io_write_benchmark_user_input_data_size(outputs, memory_limit=None):
     for file_name, file_size in outputs.items():
         print(f"[WfBench] Writing output file '{file_name}'\n")
         file_size_todo = file_size
-        while file_size_todo > 0:
-            with open(file_name, "ab") as fp:
+        with open(file_name, "wb") as fp:
+            while file_size_todo > 0:
                 chunk_size = min(file_size_todo, memory_limit)
-                file_size_todo -= fp.write(os.urandom(int(chunk_size)))
+                file_size_todo -= write_random_bytes(fp, int(chunk_size))
+
+
+def write_random_bytes(fp, size: int) -> int:
+    """
+    Write random bytes to a file. The bytes are copied from /dev/urandom within the
+    kernel (sendfile) when possible, instead of going through a Python bytes object.
+
+    :param fp: File object opened in binary write (non-append) mode.
+    :param size: Number of bytes to write.
+    :type size: int
+
+    :return: The number of bytes written.
+    :rtype: int
+    """
+    written = 0
+    if _URANDOM_FD is not None and hasattr(os, "sendfile"):
+        fp.flush()
+        try:
+            while written < size:
+                sent = os.sendfile(fp.fileno(), _URANDOM_FD, None, size - written)
+                if sent == 0:
+                    break
+                written += sent
+        except OSError:
+            pass  # e.g., kernels that cannot splice from /dev/urandom
+        if written:
+            fp.seek(0, os.SEEK_END)
+    if written < size:
+        written += fp.write(os.urandom(size - written))
+    return written
 
 
 def main():
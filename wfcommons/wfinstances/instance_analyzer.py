@@ -8,9 +8,11 @@
 # the Free Software Foundation, either version 3 of the License, or
 # (at your option) any later version.
 
+import hashlib
 import logging
 import math
 import numpy
+import re
 import scipy.stats
 
 from logging import Logger
@@ -23,6 +25,10 @@ from ..common.task import Task
 from ..common.file import FileLink
 from ..utils import best_fit_distribution, NoValue
 
+# distribution fits memoized by a digest of the fitted values (bounded, oldest entries are evicted first)
+_DISTRIBUTION_FITS_CACHE_SIZE = 256
+_distribution_fits: Dict[str, Tuple] = {}
+
 
 class InstanceElement(NoValue):
     RUNTIME = ('runtime', 'Runtime (s)')
@@ -64,7 +70,8 @@ class InstanceAnalyzer:
 
     def build_summary(self,
                       tasks_list: List[str],
-                      include_raw_data: Optional[bool] = True) -> Dict[str, Dict[str, Any]]:
+                      include_raw_data: Optional[bool] = True,
+                      cache_distribution_fits: Optional[bool] = False) -> Dict[str, Dict[str, Any]]:
         """
         Analyzes appended instances and produce a summary of the analysis per task prefix.
 
@@ -77,6 +84,9 @@ class InstanceAnalyzer:
         :type tasks_list: List[str]
         :param include_raw_data: Whether to include the raw data in the instance summary.
         :type include_raw_data: Optional[bool]
+        :param cache_distribution_fits: Whether to reuse distribution fits of previously fitted values (e.g.,
+                                        when building summaries of overlapping sets of instances).
+        :type cache_distribution_fits: Optional[bool]
 
         :return: A summary of the analysis of instances in the form of a dictionary in which keys are task prefixes.
         :rtype: Dict[str, Dict[str, Any]]
@@ -84,45 +94,55 @@ class InstanceAnalyzer:
         self.logger.debug(f'Building summary for {len(self.instances)} instances')
 
         tasks_list = sorted(list(tasks_list), key=len, reverse=True)  # had to sorted so it would get all cases
+        # alternatives are tried in order, so the longest matching prefix is found
+        # (it was eliminating bwa_index because bwa came before it)
+        tasks_prefix_pattern = re.compile('|'.join(map(re.escape, tasks_list)))
+
         # build tasks summary
         for instance in self.instances:
             self.logger.debug(f'Parsing instance: {instance.name} ({len(instance.workflow.nodes)} tasks)')
 
             for node in instance.workflow.nodes.data():
                 task: Task = node[1]['task']
-                task_name: str = [j for j in tasks_list if task.name.startswith(j)][
-                    0]  # it was eliminating bwa_index because bwa came before it
-                if task_name not in self.tasks_summary:
-                    self.tasks_summary[task_name] = []
-                self.tasks_summary[task_name].append(task)
+                match = tasks_prefix_pattern.match(task.name)
+                if match is None:
+                    raise ValueError(f'Task "{task.name}" does not match any of the workflow tasks prefixes.')
+                task_name: str = match.group(0)
+                self.tasks_summary.setdefault(task_name, []).append(task)
 
         # build instances summary
+        extensions: Dict[str, str] = {}  # file names are often shared among tasks
         for task_name in self.tasks_summary:
             runtime_list: List[float] = []
             inputs_dict: Dict[str, Any] = {}
             outputs_dict: Dict[str, Any] = {}
+            files_dicts: Dict[FileLink, Dict[str, Any]] = {FileLink.INPUT: inputs_dict, FileLink.OUTPUT: outputs_dict}
 
             for task in self.tasks_summary[task_name]:
                 runtime_list.append(task.runtime)
 
                 for file in task.files:
-                    extension: str = path.splitext(file.name)[1] if '.' in file.name else file.name
-                    if extension[1:].isnumeric():
-                        extension = path.splitext(file.name.replace(extension, ''))[1]
-
-                    if file.link == FileLink.INPUT:
-                        _append_file_to_dict(extension, inputs_dict, file.size)
-                    elif file.link == FileLink.OUTPUT:
-                        _append_file_to_dict(extension, outputs_dict, file.size)
-
-            _best_fit_distribution_for_file(inputs_dict, include_raw_data)
-            _best_fit_distribution_for_file(outputs_dict, include_raw_data)
-
+                    files_dict = files_dicts.get(file.link)
+                    if files_dict is None:
+                        continue
+                    extension: Optional[str] = extensions.get(file.name)
+                    if extension is None:
+                        extension = extensions[file.name] = _file_extension(file.name)
+                    _append_file_to_dict(extension, files_dict, file.size)
+
+            _best_fit_distribution_for_file(inputs_dict, include_raw_data, cache_distribution_fits)
+            _best_fit_distribution_for_file(outputs_dict, include_raw_data, cache_distribution_fits)
+
+            runtimes = numpy.asarray(runtime_list)
+            runtime_min, runtime_max = runtimes.min().item(), runtimes.max().item()
             self.instances_summary[task_name] = {
                 'runtime': {
-                    'min': min(runtime_list),
-                    'max': max(runtime_list),
-                    'distribution': _json_format_distribution_fit(best_fit_distribution(runtime_list))
+                    'min': runtime_min,
+                    'max': runtime_max,
+                    # as for files, constant values are not fitted to a distribution
+                    'distribution': _json_format_distribution_fit(
+                        _best_fit_distribution(runtimes, cache_distribution_fits))
+                    if runtime_min != runtime_max else None
                 },
                 'input': inputs_dict,
                 'output': outputs_dict
@@ -171,6 +191,22 @@ class InstanceAnalyzer:
             self.generate_fit_plots(instance_element, outfile_prefix)
 
 
+def _file_extension(file_name: str) -> str:
+    """
+    Get the file type extension of a file (numeric extensions are skipped).
+
+    :param file_name: File name.
+    :type file_name: str
+
+    :return: The file type extension (or the file name if it has no extension).
+    :rtype: str
+    """
+    extension: str = path.splitext(file_name)[1] if '.' in file_name else file_name
+    if extension[1:].isnumeric():
+        extension = path.splitext(file_name.replace(extension, ''))[1]
+    return extension
+
+
 def _append_file_to_dict(extension: str, dict_obj: Dict[str, Any], file_size: int) -> None:
     """
     Add a file size to a file type extension dictionary.
@@ -182,12 +218,13 @@ def _append_file_to_dict(extension: str, dict_obj: Dict[str, Any], file_size: in
     :param file_size: File size in bytes.
     :type file_size: int
     """
-    if extension not in dict_obj:
-        dict_obj[extension] = {'data': [], 'distribution': None}
-    dict_obj[extension]['data'].append(file_size)
+    entry = dict_obj.get(extension)
+    if entry is None:
+        entry = dict_obj[extension] = {'data': [], 'distribution': None}
+    entry['data'].append(file_size)
 
 
-def _best_fit_distribution_for_file(dict_obj, include_raw_data) -> None:
+def _best_fit_distribution_for_file(dict_obj, include_raw_data, cached=False) -> None:
     """
     Find the best fit distribution for a file.
 
@@ -195,17 +232,46 @@ def _best_fit_distribution_for_file(dict_obj, include_raw_data) -> None:
     :type dict_obj: Dict[str, Any]
     :param include_raw_data:
     :type include_raw_data: bool
+    :param cached: Whether to reuse distribution fits of previously fitted values.
+    :type cached: bool
     """
     for ext in dict_obj:
-        dict_obj[ext]['min'] = min(dict_obj[ext]['data'])
-        dict_obj[ext]['max'] = max(dict_obj[ext]['data'])
+        sizes = numpy.asarray(dict_obj[ext]['data'])
+        dict_obj[ext]['min'] = sizes.min().item()
+        dict_obj[ext]['max'] = sizes.max().item()
         if dict_obj[ext]['min'] != dict_obj[ext]['max']:
-            dict_obj[ext]['distribution'] = _json_format_distribution_fit(
-                best_fit_distribution(dict_obj[ext]['data']))
+            dict_obj[ext]['distribution'] = _json_format_distribution_fit(_best_fit_distribution(sizes, cached))
         if not include_raw_data:
             del dict_obj[ext]['data']
 
 
+def _best_fit_distribution(data: numpy.ndarray, cached: bool = False) -> Tuple:
+    """
+    Find the best fit distribution for a set of values.
+
+    :param data: Values to be fitted to a distribution.
+    :type data: numpy.ndarray
+    :param cached: Whether to reuse the fit of previously fitted values.
+    :type cached: bool
+
+    :return: The name of the distribution and its parameters.
+    :rtype: Tuple
+    """
+    if not cached:
+        return best_fit_distribution(data)
+
+    # the fit only depends on the values histogram, not on their order
+    data = numpy.sort(data)
+    key = f"{data.dtype.str}:{hashlib.sha1(data.tobytes()).hexdigest()}"
+    fit = _distribution_fits.get(key)
+    if fit is None:
+        fit = best_fit_distribution(data)
+        if len(_distribution_fits) >= _DISTRIBUTION_FITS_CACHE_SIZE:
+            del _distribution_fits[next(iter(_distribution_fits))]
+        _distribution_fits[key] = fit
+    return fit
+
+
 def _json_format_distribution_fit(dist_tuple: Tuple) -> Dict[str, Any]:
     """
     Format the best fit distribution data into a dictionary
@@ -216,10 +282,7 @@ def _json_format_distribution_fit(dist_tuple: Tuple) -> Dict[str, Any]:
     :return:
     :rtype: Dict[str, Any]
     """
-    formatted_entry = {'name': dist_tuple[0], 'params': []}
-    for p in dist_tuple[1]:
-        formatted_entry['params'].append(p)
-    return formatted_entry
+    return {'name': dist_tuple[0], 'params': list(dist_tuple[1])}
 
 
 def _generate_fit_plots(el: Dict, title: str, xlabel: str, outfile: str, font_size: Optional[int] = None,